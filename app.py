@@ -8,9 +8,9 @@ from datetime import datetime
 import uuid
 from werkzeug.utils import secure_filename
 from flask import send_from_directory
-from issue_validator import CivicValidator
+from issue_validator import CivicValidator, VALIDATION_INSERT_SQL, score_key, ensure_validations_schema
 from flask import Flask, jsonify
-from department_analytics import DepartmentAnalytics
+from department_analytics import DepartmentAnalytics, ensure_issues_schema
 
 
 
@@ -73,11 +73,17 @@ def init_db():
             assigned_to TEXT,                        -- officer name
             max_deadline DATE,                       -- deadline for issue
             proof_photo_url TEXT,                    -- uploaded proof image
+            completed INTEGER DEFAULT 0,             -- 1 once a proof photo is uploaded (kept by triggers)
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     ''')
-    
+
+    # Analytics column, indexes, triggers and summary tables (shared with debug.py)
+    ensure_issues_schema(conn)
+    # Indexed score_key on issue_validations, once debug.py has created it
+    ensure_validations_schema(conn)
+
     conn.commit()
     conn.close()
 
@@ -264,14 +270,12 @@ def report_issue():
             INSERT INTO issues (id, title, description, category, constituency, location, image_url, reported_by)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?)
         """, (issue_id, title, description, category, constituency, location, image_url, uid))
-        conn.commit()
 
-        # Insert into referencing table for validation (new, separate table)
-        cursor.execute("""
-            INSERT INTO issue_validations
-            (issue_id, image_valid, image_msg, florence_caption, civic_score)
-            VALUES (?, ?, ?, ?, ?)""",
-            (issue_id, int(img_valid), img_msg, florence_caption, civic_score)
+        # Insert into referencing table for validation (new, separate table),
+        # committed together with the issue so both rows cost one transaction
+        cursor.execute(VALIDATION_INSERT_SQL,
+            (issue_id, int(img_valid), img_msg, florence_caption, civic_score,
+             score_key(florence_caption, description) if civic_score else None)
         )
         conn.commit()
         conn.close()
@@ -1,4 +1,6 @@
 import sqlite3
+from department_analytics import ensure_issues_schema
+from issue_validator import ensure_validations_schema
 
 # Path to your existing SQLite .db file
 db_path = 'civic_issues.db'  # <-- Replace this with your actual file path
@@ -12,6 +14,7 @@ CREATE TABLE IF NOT EXISTS issue_validations (
     image_msg TEXT,
     florence_caption TEXT,
     civic_score TEXT,
+    score_key TEXT,                -- digest of (florence_caption, issue description)
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 """
@@ -34,5 +37,22 @@ def create_table(db_path, create_sql):
     except sqlite3.Error as e:
         print(f"An error occurred: {e}")
 
-# Run the function
+def migrate_issues(db_path):
+    try:
+        conn = sqlite3.connect(db_path)
+
+        # Same column, index and trigger setup that app.py's init_db runs
+        ensure_issues_schema(conn)
+        ensure_validations_schema(conn)
+
+        conn.commit()
+        conn.close()
+
+        print("Analytics column, indexes, triggers and summary tables for 'issues' created successfully (if they didn't already exist).")
+
+    except sqlite3.Error as e:
+        print(f"An error occurred: {e}")
+
+# Run the functions
 create_table(db_path, create_table_sql)
+migrate_issues(db_path)
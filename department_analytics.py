@@ -1,11 +1,259 @@
 import sqlite3
 import os
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 import yaml
 
+# Indexes and triggers on issues that the analytics queries rely on. The completed
+# column is a denormalized copy of the proof_photo_url check, kept in sync on write.
+_ISSUES_SCHEMA_SQL = """
+CREATE INDEX IF NOT EXISTS idx_issues_created ON issues(created_at);
+CREATE INDEX IF NOT EXISTS idx_issues_cat ON issues(category);
+CREATE INDEX IF NOT EXISTS idx_issues_const ON issues(constituency);
+CREATE INDEX IF NOT EXISTS idx_issues_completed ON issues(completed);
+CREATE INDEX IF NOT EXISTS idx_issues_urgent_open ON issues(upvotes DESC, created_at ASC) WHERE acknowledged = 0 OR completed = 0;
+CREATE TRIGGER IF NOT EXISTS trg_issues_completed_insert AFTER INSERT ON issues
+BEGIN
+    UPDATE issues SET completed = (NEW.proof_photo_url IS NOT NULL AND NEW.proof_photo_url != 'To be done') WHERE id = NEW.id;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_issues_completed AFTER UPDATE OF proof_photo_url ON issues
+BEGIN
+    UPDATE issues SET completed = (NEW.proof_photo_url IS NOT NULL AND NEW.proof_photo_url != 'To be done') WHERE id = NEW.id;
+END;
+"""
+
+# Materialized dashboard aggregates, one row per overview/category/constituency/day,
+# kept current by triggers that take the old row's contribution out and add the
+# new row's. Completion is read from proof_photo_url rather than the completed
+# column so these triggers don't depend on firing after trg_issues_completed.
+_SUMMARY_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS issues_overview (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    total_issues INTEGER NOT NULL DEFAULT 0,
+    acknowledged INTEGER NOT NULL DEFAULT 0,
+    completed INTEGER NOT NULL DEFAULT 0,
+    pending INTEGER NOT NULL DEFAULT 0,
+    total_upvotes INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO issues_overview (id) VALUES (1);
+CREATE TABLE IF NOT EXISTS issues_by_category (
+    category TEXT PRIMARY KEY,
+    total_issues INTEGER NOT NULL DEFAULT 0,
+    acknowledged INTEGER NOT NULL DEFAULT 0,
+    completed INTEGER NOT NULL DEFAULT 0,
+    total_upvotes INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS issues_by_constituency (
+    constituency TEXT PRIMARY KEY,
+    total_issues INTEGER NOT NULL DEFAULT 0,
+    acknowledged INTEGER NOT NULL DEFAULT 0,
+    completed INTEGER NOT NULL DEFAULT 0,
+    total_upvotes INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS issues_by_day (
+    day TEXT PRIMARY KEY,
+    total_issues INTEGER NOT NULL DEFAULT 0,
+    acknowledged INTEGER NOT NULL DEFAULT 0,
+    completed INTEGER NOT NULL DEFAULT 0,
+    total_upvotes INTEGER NOT NULL DEFAULT 0
+);
+CREATE TRIGGER IF NOT EXISTS trg_issues_summary_insert AFTER INSERT ON issues
+BEGIN
+    UPDATE issues_overview SET
+        total_issues = total_issues + 1,
+        acknowledged = acknowledged + COALESCE(NEW.acknowledged = 1, 0),
+        completed = completed + (NEW.proof_photo_url IS NOT NULL AND NEW.proof_photo_url != 'To be done'),
+        pending = pending + COALESCE(NEW.acknowledged = 0, 0),
+        total_upvotes = total_upvotes + COALESCE(NEW.upvotes, 0)
+    WHERE id = 1;
+    INSERT INTO issues_by_category (category, total_issues, acknowledged, completed, total_upvotes)
+    VALUES (NEW.category, 1, COALESCE(NEW.acknowledged = 1, 0),
+            (NEW.proof_photo_url IS NOT NULL AND NEW.proof_photo_url != 'To be done'), COALESCE(NEW.upvotes, 0))
+    ON CONFLICT(category) DO UPDATE SET
+        total_issues = total_issues + 1,
+        acknowledged = acknowledged + excluded.acknowledged,
+        completed = completed + excluded.completed,
+        total_upvotes = total_upvotes + excluded.total_upvotes;
+    INSERT INTO issues_by_constituency (constituency, total_issues, acknowledged, completed, total_upvotes)
+    VALUES (NEW.constituency, 1, COALESCE(NEW.acknowledged = 1, 0),
+            (NEW.proof_photo_url IS NOT NULL AND NEW.proof_photo_url != 'To be done'), COALESCE(NEW.upvotes, 0))
+    ON CONFLICT(constituency) DO UPDATE SET
+        total_issues = total_issues + 1,
+        acknowledged = acknowledged + excluded.acknowledged,
+        completed = completed + excluded.completed,
+        total_upvotes = total_upvotes + excluded.total_upvotes;
+    INSERT INTO issues_by_day (day, total_issues, acknowledged, completed, total_upvotes)
+    VALUES (DATE(NEW.created_at), 1, COALESCE(NEW.acknowledged = 1, 0),
+            (NEW.proof_photo_url IS NOT NULL AND NEW.proof_photo_url != 'To be done'), COALESCE(NEW.upvotes, 0))
+    ON CONFLICT(day) DO UPDATE SET
+        total_issues = total_issues + 1,
+        acknowledged = acknowledged + excluded.acknowledged,
+        completed = completed + excluded.completed,
+        total_upvotes = total_upvotes + excluded.total_upvotes;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_issues_summary_update
+AFTER UPDATE OF category, constituency, acknowledged, proof_photo_url, upvotes, created_at ON issues
+BEGIN
+    UPDATE issues_overview SET
+        acknowledged = acknowledged - COALESCE(OLD.acknowledged = 1, 0) + COALESCE(NEW.acknowledged = 1, 0),
+        completed = completed - (OLD.proof_photo_url IS NOT NULL AND OLD.proof_photo_url != 'To be done')
+                              + (NEW.proof_photo_url IS NOT NULL AND NEW.proof_photo_url != 'To be done'),
+        pending = pending - COALESCE(OLD.acknowledged = 0, 0) + COALESCE(NEW.acknowledged = 0, 0),
+        total_upvotes = total_upvotes - COALESCE(OLD.upvotes, 0) + COALESCE(NEW.upvotes, 0)
+    WHERE id = 1;
+    UPDATE issues_by_category SET
+        total_issues = total_issues - 1,
+        acknowledged = acknowledged - COALESCE(OLD.acknowledged = 1, 0),
+        completed = completed - (OLD.proof_photo_url IS NOT NULL AND OLD.proof_photo_url != 'To be done'),
+        total_upvotes = total_upvotes - COALESCE(OLD.upvotes, 0)
+    WHERE category = OLD.category;
+    DELETE FROM issues_by_category WHERE category = OLD.category AND total_issues <= 0;
+    INSERT INTO issues_by_category (category, total_issues, acknowledged, completed, total_upvotes)
+    VALUES (NEW.category, 1, COALESCE(NEW.acknowledged = 1, 0),
+            (NEW.proof_photo_url IS NOT NULL AND NEW.proof_photo_url != 'To be done'), COALESCE(NEW.upvotes, 0))
+    ON CONFLICT(category) DO UPDATE SET
+        total_issues = total_issues + 1,
+        acknowledged = acknowledged + excluded.acknowledged,
+        completed = completed + excluded.completed,
+        total_upvotes = total_upvotes + excluded.total_upvotes;
+    UPDATE issues_by_constituency SET
+        total_issues = total_issues - 1,
+        acknowledged = acknowledged - COALESCE(OLD.acknowledged = 1, 0),
+        completed = completed - (OLD.proof_photo_url IS NOT NULL AND OLD.proof_photo_url != 'To be done'),
+        total_upvotes = total_upvotes - COALESCE(OLD.upvotes, 0)
+    WHERE constituency = OLD.constituency;
+    DELETE FROM issues_by_constituency WHERE constituency = OLD.constituency AND total_issues <= 0;
+    INSERT INTO issues_by_constituency (constituency, total_issues, acknowledged, completed, total_upvotes)
+    VALUES (NEW.constituency, 1, COALESCE(NEW.acknowledged = 1, 0),
+            (NEW.proof_photo_url IS NOT NULL AND NEW.proof_photo_url != 'To be done'), COALESCE(NEW.upvotes, 0))
+    ON CONFLICT(constituency) DO UPDATE SET
+        total_issues = total_issues + 1,
+        acknowledged = acknowledged + excluded.acknowledged,
+        completed = completed + excluded.completed,
+        total_upvotes = total_upvotes + excluded.total_upvotes;
+    UPDATE issues_by_day SET
+        total_issues = total_issues - 1,
+        acknowledged = acknowledged - COALESCE(OLD.acknowledged = 1, 0),
+        completed = completed - (OLD.proof_photo_url IS NOT NULL AND OLD.proof_photo_url != 'To be done'),
+        total_upvotes = total_upvotes - COALESCE(OLD.upvotes, 0)
+    WHERE day = DATE(OLD.created_at);
+    DELETE FROM issues_by_day WHERE day = DATE(OLD.created_at) AND total_issues <= 0;
+    INSERT INTO issues_by_day (day, total_issues, acknowledged, completed, total_upvotes)
+    VALUES (DATE(NEW.created_at), 1, COALESCE(NEW.acknowledged = 1, 0),
+            (NEW.proof_photo_url IS NOT NULL AND NEW.proof_photo_url != 'To be done'), COALESCE(NEW.upvotes, 0))
+    ON CONFLICT(day) DO UPDATE SET
+        total_issues = total_issues + 1,
+        acknowledged = acknowledged + excluded.acknowledged,
+        completed = completed + excluded.completed,
+        total_upvotes = total_upvotes + excluded.total_upvotes;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_issues_summary_delete AFTER DELETE ON issues
+BEGIN
+    UPDATE issues_overview SET
+        total_issues = total_issues - 1,
+        acknowledged = acknowledged - COALESCE(OLD.acknowledged = 1, 0),
+        completed = completed - (OLD.proof_photo_url IS NOT NULL AND OLD.proof_photo_url != 'To be done'),
+        pending = pending - COALESCE(OLD.acknowledged = 0, 0),
+        total_upvotes = total_upvotes - COALESCE(OLD.upvotes, 0)
+    WHERE id = 1;
+    UPDATE issues_by_category SET
+        total_issues = total_issues - 1,
+        acknowledged = acknowledged - COALESCE(OLD.acknowledged = 1, 0),
+        completed = completed - (OLD.proof_photo_url IS NOT NULL AND OLD.proof_photo_url != 'To be done'),
+        total_upvotes = total_upvotes - COALESCE(OLD.upvotes, 0)
+    WHERE category = OLD.category;
+    DELETE FROM issues_by_category WHERE category = OLD.category AND total_issues <= 0;
+    UPDATE issues_by_constituency SET
+        total_issues = total_issues - 1,
+        acknowledged = acknowledged - COALESCE(OLD.acknowledged = 1, 0),
+        completed = completed - (OLD.proof_photo_url IS NOT NULL AND OLD.proof_photo_url != 'To be done'),
+        total_upvotes = total_upvotes - COALESCE(OLD.upvotes, 0)
+    WHERE constituency = OLD.constituency;
+    DELETE FROM issues_by_constituency WHERE constituency = OLD.constituency AND total_issues <= 0;
+    UPDATE issues_by_day SET
+        total_issues = total_issues - 1,
+        acknowledged = acknowledged - COALESCE(OLD.acknowledged = 1, 0),
+        completed = completed - (OLD.proof_photo_url IS NOT NULL AND OLD.proof_photo_url != 'To be done'),
+        total_upvotes = total_upvotes - COALESCE(OLD.upvotes, 0)
+    WHERE day = DATE(OLD.created_at);
+    DELETE FROM issues_by_day WHERE day = DATE(OLD.created_at) AND total_issues <= 0;
+END;
+"""
+
+# Recomputes every summary table from a full scan of issues
+_SUMMARY_REBUILD_SQL = """
+UPDATE issues_overview SET
+    total_issues = (SELECT COUNT(*) FROM issues),
+    acknowledged = (SELECT COALESCE(SUM(COALESCE(acknowledged = 1, 0)), 0) FROM issues),
+    completed = (SELECT COALESCE(SUM(proof_photo_url IS NOT NULL AND proof_photo_url != 'To be done'), 0) FROM issues),
+    pending = (SELECT COALESCE(SUM(COALESCE(acknowledged = 0, 0)), 0) FROM issues),
+    total_upvotes = (SELECT COALESCE(SUM(upvotes), 0) FROM issues)
+WHERE id = 1;
+DELETE FROM issues_by_category;
+INSERT INTO issues_by_category (category, total_issues, acknowledged, completed, total_upvotes)
+SELECT category, COUNT(*), SUM(COALESCE(acknowledged = 1, 0)),
+       SUM(proof_photo_url IS NOT NULL AND proof_photo_url != 'To be done'), COALESCE(SUM(upvotes), 0)
+FROM issues
+GROUP BY category;
+DELETE FROM issues_by_constituency;
+INSERT INTO issues_by_constituency (constituency, total_issues, acknowledged, completed, total_upvotes)
+SELECT constituency, COUNT(*), SUM(COALESCE(acknowledged = 1, 0)),
+       SUM(proof_photo_url IS NOT NULL AND proof_photo_url != 'To be done'), COALESCE(SUM(upvotes), 0)
+FROM issues
+GROUP BY constituency;
+DELETE FROM issues_by_day;
+INSERT INTO issues_by_day (day, total_issues, acknowledged, completed, total_upvotes)
+SELECT DATE(created_at), COUNT(*), SUM(COALESCE(acknowledged = 1, 0)),
+       SUM(proof_photo_url IS NOT NULL AND proof_photo_url != 'To be done'), COALESCE(SUM(upvotes), 0)
+FROM issues
+GROUP BY DATE(created_at);
+"""
+
+# Rates over summary-shaped rows, rounded by SQLite for every section alike
+# (ROUND takes halves away from zero, unlike Python's round)
+_COMPLETION_RATE_SQL = "ROUND(COALESCE(100.0 * completed / NULLIF(acknowledged, 0), 0), 2)"
+_ACKNOWLEDGMENT_RATE_SQL = "ROUND(COALESCE(100.0 * acknowledged / NULLIF(total_issues, 0), 0), 2)"
+_AVG_UPVOTES_SQL = "ROUND(COALESCE(CAST(total_upvotes AS REAL) / NULLIF(total_issues, 0), 0), 2)"
+
+# Output keys, in SELECT order, for the plain-tuple analytics rows
+_OVERVIEW_COLS = ('total_issues', 'acknowledged_issues', 'completed_issues', 'pending_issues',
+                  'completion_rate', 'acknowledgment_rate', 'avg_upvotes')
+_CAT_COLS = ('category', 'total_issues', 'acknowledged', 'completed',
+             'completion_rate', 'acknowledgment_rate', 'total_upvotes', 'avg_upvotes')
+_CONST_COLS = ('constituency',) + _CAT_COLS[1:]
+_TIME_SERIES_COLS = ('date', 'issues_reported', 'issues_acknowledged', 'issues_completed')
+
+
+def ensure_issues_schema(conn):
+    """Bring an existing issues table up to the analytics schema, including the summary tables."""
+    # Databases created before the completed column need it added and backfilled
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(issues)")]
+    if 'completed' not in columns:
+        conn.execute("ALTER TABLE issues ADD COLUMN completed INTEGER DEFAULT 0")
+        conn.execute("UPDATE issues SET completed = (proof_photo_url IS NOT NULL AND proof_photo_url != 'To be done')")
+    conn.executescript(_ISSUES_SCHEMA_SQL)
+    # Summary tables are created and filled in one go the first time; after that
+    # their triggers keep them current
+    has_summaries = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'trg_issues_summary_insert'"
+    ).fetchone()
+    if not has_summaries:
+        conn.executescript('BEGIN;' + _SUMMARY_SCHEMA_SQL + _SUMMARY_REBUILD_SQL + 'COMMIT;')
+
+
 class DepartmentAnalytics:
-    def __init__(self, database_path='civic_issues.db', groq_api_key=None, config_path="config.yaml"):
+    def __init__(self, database_path='civic_issues.db', groq_api_key=None, config_path="config.yaml", read_pool_size=4):
+        if read_pool_size < 1:
+            raise ValueError("read_pool_size must be at least 1")
         self.database_path = database_path
+        # Idle read connections, reused across calls so each keeps its page and
+        # statement caches instead of reopening the database file every time.
+        self._read_pool = queue.Queue(maxsize=read_pool_size)
+        # Workers for the dashboard sections, one per pooled connection; its
+        # threads start on first use and are reused by every later dashboard call.
+        self._executor = ThreadPoolExecutor(max_workers=read_pool_size, thread_name_prefix='analytics')
         self.groq_api_key = groq_api_key
         if os.path.exists(config_path):
             try:
@@ -24,185 +272,252 @@ class DepartmentAnalytics:
                 self.groq_client = Groq(api_key=self.groq_api_key)
             except Exception as e:
                 print(f"Groq initialization failed: {e}")
+        self._ensure_schema()
+
+    def _ensure_schema(self):
+        """Apply the analytics schema if the issues table already exists."""
+        conn = self.get_db_connection()
+        try:
+            has_issues = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'issues'"
+            ).fetchone()
+            if has_issues:
+                ensure_issues_schema(conn)
+        except sqlite3.Error as e:
+            print(f"Analytics schema error: {e}")
+        finally:
+            conn.close()
 
     def get_db_connection(self):
-        conn = sqlite3.connect(self.database_path)
-        conn.row_factory = sqlite3.Row
+        # Rows stay plain tuples; the getters zip them with their column tuples
+        conn = sqlite3.connect(self.database_path, check_same_thread=False)
+        # WAL lets dashboard reads run alongside app writes; the remaining
+        # settings trade fsyncs and temp files for memory on scan-heavy queries.
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA cache_size=-64000')
+        conn.execute('PRAGMA mmap_size=268435456')
+        conn.execute('PRAGMA busy_timeout=5000')
         return conn
 
-    def get_department_overview(self):
+    @contextmanager
+    def _read_connection(self):
+        """Borrow a read connection from the pool, opening one if none is idle."""
         try:
+            conn = self._read_pool.get_nowait()
+        except queue.Empty:
             conn = self.get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) AS total_issues FROM issues")
-            total_issues = cursor.fetchone()['total_issues']
-            cursor.execute("SELECT COUNT(*) AS acknowledged FROM issues WHERE acknowledged = 1")
-            acknowledged_issues = cursor.fetchone()['acknowledged']
-            cursor.execute("SELECT COUNT(*) AS completed FROM issues WHERE proof_photo_url IS NOT NULL AND proof_photo_url != 'To be done'")
-            completed_issues = cursor.fetchone()['completed']
-            cursor.execute("SELECT COUNT(*) AS pending FROM issues WHERE acknowledged = 0")
-            pending_issues = cursor.fetchone()['pending']
-            cursor.execute("SELECT AVG(upvotes) AS avg_upvotes FROM issues")
-            avg_upvotes = cursor.fetchone()['avg_upvotes'] or 0
-            completion_rate = (completed_issues / acknowledged_issues * 100) if acknowledged_issues > 0 else 0
-            acknowledgment_rate = (acknowledged_issues / total_issues * 100) if total_issues > 0 else 0
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            try:
+                self._read_pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    def _run_read(self, query, *args):
+        """Run a cursor-taking query helper on a pooled read connection."""
+        with self._read_connection() as conn:
+            return query(conn.cursor(), *args)
+
+    def rebuild_summary_tables(self):
+        """
+        Recompute the summary tables from a full scan of issues, to repair them if
+        issues were ever written with the triggers missing. The getters' refresh=True
+        flag is unrelated: it only reads via the scan queries and leaves the tables alone.
+        """
+        conn = self.get_db_connection()
+        try:
+            conn.executescript('BEGIN;' + _SUMMARY_REBUILD_SQL + 'COMMIT;')
+        finally:
             conn.close()
-            return {
-                'total_issues': total_issues,
-                'acknowledged_issues': acknowledged_issues,
-                'completed_issues': completed_issues,
-                'pending_issues': pending_issues,
-                'completion_rate': round(completion_rate, 2),
-                'acknowledgment_rate': round(acknowledgment_rate, 2),
-                'avg_upvotes': round(avg_upvotes, 2)
-            }
+
+    def get_department_overview(self, refresh=False):
+        return self._run_read(self._get_overview, refresh)
+
+    def get_category_performance(self, refresh=False):
+        return self._run_read(self._get_category_performance, refresh)
+
+    def get_constituency_performance(self, refresh=False):
+        return self._run_read(self._get_constituency_performance, refresh)
+
+    def get_time_series_data(self, days=30, refresh=False):
+        return self._run_read(self._get_time_series_data, days, refresh)
+
+    def get_urgent_issues(self, limit=10):
+        return self._run_read(self._get_urgent_issues, limit)
+
+    def _get_overview(self, cursor, refresh=False):
+        try:
+            if refresh:
+                source = """(
+                    SELECT COUNT(*) AS total_issues,
+                           COALESCE(SUM(CASE WHEN acknowledged = 1 THEN 1 ELSE 0 END), 0) AS acknowledged,
+                           COALESCE(SUM(completed), 0) AS completed,
+                           COALESCE(SUM(CASE WHEN acknowledged = 0 THEN 1 ELSE 0 END), 0) AS pending,
+                           COALESCE(SUM(upvotes), 0) AS total_upvotes
+                    FROM issues
+                )"""
+            else:
+                source = "issues_overview WHERE id = 1"
+            cursor.execute(f"""
+                SELECT total_issues, acknowledged, completed, pending,
+                       {_COMPLETION_RATE_SQL} AS completion_rate,
+                       {_ACKNOWLEDGMENT_RATE_SQL} AS acknowledgment_rate,
+                       {_AVG_UPVOTES_SQL} AS avg_upvotes
+                FROM {source}
+            """)
+            return dict(zip(_OVERVIEW_COLS, cursor.fetchone()))
         except Exception as e:
             print(f"Department overview error: {e}")
             return {}
 
-    def get_category_performance(self):
+    def _get_category_performance(self, cursor, refresh=False):
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT category,
-                       COUNT(*) AS total_issues,
-                       SUM(CASE WHEN acknowledged = 1 THEN 1 ELSE 0 END) AS acknowledged,
-                       SUM(CASE WHEN proof_photo_url IS NOT NULL AND proof_photo_url != 'To be done' THEN 1 ELSE 0 END) AS completed,
-                       SUM(upvotes) AS total_upvotes,
-                       AVG(upvotes) AS avg_upvotes
-                FROM issues
-                GROUP BY category
-                ORDER BY total_issues DESC
+            if refresh:
+                source = """(
+                    SELECT category,
+                           COUNT(*) AS total_issues,
+                           SUM(CASE WHEN acknowledged = 1 THEN 1 ELSE 0 END) AS acknowledged,
+                           SUM(completed) AS completed,
+                           COALESCE(SUM(upvotes), 0) AS total_upvotes
+                    FROM issues
+                    GROUP BY category
+                )"""
+            else:
+                source = "issues_by_category"
+            # Rates are computed by SQLite so each row comes back ready to serialize
+            cursor.execute(f"""
+                SELECT category, total_issues, acknowledged, completed,
+                       {_COMPLETION_RATE_SQL} AS completion_rate,
+                       {_ACKNOWLEDGMENT_RATE_SQL} AS acknowledgment_rate,
+                       total_upvotes,
+                       {_AVG_UPVOTES_SQL} AS avg_upvotes
+                FROM {source}
+                ORDER BY total_issues DESC, category
             """)
-            results = cursor.fetchall()
-            conn.close()
-            category_data = []
-            for row in results:
-                completion_rate = (row['completed'] / row['acknowledged'] * 100) if row['acknowledged'] > 0 else 0
-                acknowledgment_rate = (row['acknowledged'] / row['total_issues'] * 100) if row['total_issues'] > 0 else 0
-                category_data.append({
-                    'category': row['category'],
-                    'total_issues': row['total_issues'],
-                    'acknowledged': row['acknowledged'],
-                    'completed': row['completed'],
-                    'completion_rate': round(completion_rate, 2),
-                    'acknowledgment_rate': round(acknowledgment_rate, 2),
-                    'total_upvotes': row['total_upvotes'] or 0,
-                    'avg_upvotes': round(row['avg_upvotes'] or 0, 2)
-                })
-            return category_data
+            return [dict(zip(_CAT_COLS, r)) for r in cursor.fetchall()]
         except Exception as e:
             print(f"Category performance error: {e}")
             return []
 
-    def get_constituency_performance(self):
+    def _get_constituency_performance(self, cursor, refresh=False):
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT constituency,
-                       COUNT(*) AS total_issues,
-                       SUM(CASE WHEN acknowledged = 1 THEN 1 ELSE 0 END) AS acknowledged,
-                       SUM(CASE WHEN proof_photo_url IS NOT NULL AND proof_photo_url != 'To be done' THEN 1 ELSE 0 END) AS completed,
-                       SUM(upvotes) AS total_upvotes,
-                       AVG(upvotes) AS avg_upvotes
-                FROM issues
-                GROUP BY constituency
-                ORDER BY total_issues DESC
+            if refresh:
+                source = """(
+                    SELECT constituency,
+                           COUNT(*) AS total_issues,
+                           SUM(CASE WHEN acknowledged = 1 THEN 1 ELSE 0 END) AS acknowledged,
+                           SUM(completed) AS completed,
+                           COALESCE(SUM(upvotes), 0) AS total_upvotes
+                    FROM issues
+                    GROUP BY constituency
+                )"""
+            else:
+                source = "issues_by_constituency"
+            # Rates are computed by SQLite so each row comes back ready to serialize
+            cursor.execute(f"""
+                SELECT constituency, total_issues, acknowledged, completed,
+                       {_COMPLETION_RATE_SQL} AS completion_rate,
+                       {_ACKNOWLEDGMENT_RATE_SQL} AS acknowledgment_rate,
+                       total_upvotes,
+                       {_AVG_UPVOTES_SQL} AS avg_upvotes
+                FROM {source}
+                ORDER BY total_issues DESC, constituency
             """)
-            results = cursor.fetchall()
-            conn.close()
-            constituency_data = []
-            for row in results:
-                completion_rate = (row['completed'] / row['acknowledged'] * 100) if row['acknowledged'] > 0 else 0
-                acknowledgment_rate = (row['acknowledged'] / row['total_issues'] * 100) if row['total_issues'] > 0 else 0
-                constituency_data.append({
-                    'constituency': row['constituency'],
-                    'total_issues': row['total_issues'],
-                    'acknowledged': row['acknowledged'],
-                    'completed': row['completed'],
-                    'completion_rate': round(completion_rate, 2),
-                    'acknowledgment_rate': round(acknowledgment_rate, 2),
-                    'total_upvotes': row['total_upvotes'] or 0,
-                    'avg_upvotes': round(row['avg_upvotes'] or 0, 2)
-                })
-            return constituency_data
+            return [dict(zip(_CONST_COLS, r)) for r in cursor.fetchall()]
         except Exception as e:
             print(f"Constituency performance error: {e}")
             return []
 
-    def get_time_series_data(self, days=30):
+    def _get_time_series_data(self, cursor, days=30, refresh=False):
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
             start_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
-            cursor.execute("""
-                SELECT DATE(created_at) AS date,
-                       COUNT(*) AS issues_reported,
-                       SUM(CASE WHEN acknowledged = 1 THEN 1 ELSE 0 END) AS issues_acknowledged,
-                       SUM(CASE WHEN proof_photo_url IS NOT NULL AND proof_photo_url != 'To be done' THEN 1 ELSE 0 END) AS issues_completed
-                FROM issues
-                WHERE DATE(created_at) >= ?
-                GROUP BY DATE(created_at)
-                ORDER BY DATE(created_at)
-            """, (start_date,))
-            results = cursor.fetchall()
-            conn.close()
-            time_series = []
-            for row in results:
-                time_series.append({
-                    'date': row['date'],
-                    'issues_reported': row['issues_reported'],
-                    'issues_acknowledged': row['issues_acknowledged'],
-                    'issues_completed': row['issues_completed']
-                })
-            return time_series
+            if refresh:
+                # Compare the raw timestamp so the range can use idx_issues_created
+                cursor.execute("""
+                    SELECT substr(created_at, 1, 10) AS date,
+                           COUNT(*) AS issues_reported,
+                           SUM(CASE WHEN acknowledged = 1 THEN 1 ELSE 0 END) AS issues_acknowledged,
+                           SUM(completed) AS issues_completed
+                    FROM issues
+                    WHERE created_at >= ?
+                    GROUP BY 1
+                    ORDER BY 1
+                """, (start_date + ' 00:00:00',))
+            else:
+                cursor.execute("""
+                    SELECT day AS date,
+                           total_issues AS issues_reported,
+                           acknowledged AS issues_acknowledged,
+                           completed AS issues_completed
+                    FROM issues_by_day
+                    WHERE day >= ?
+                    ORDER BY day
+                """, (start_date,))
+            return [dict(zip(_TIME_SERIES_COLS, r)) for r in cursor.fetchall()]
         except Exception as e:
             print(f"Time series error: {e}")
             return []
 
-    def get_urgent_issues(self, limit=10):
+    def _get_urgent_issues(self, cursor, limit=10):
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
             cursor.execute("""
-                SELECT *,
-                       julianday('now') - julianday(created_at) AS days_pending
-                FROM issues
-                WHERE acknowledged = 0 OR (acknowledged = 1 AND (proof_photo_url IS NULL OR proof_photo_url = 'To be done'))
-                ORDER BY upvotes DESC, days_pending DESC
+                SELECT id, title, category, constituency, upvotes, assigned_to, acknowledged,
+                       ROUND(julianday('now') - julianday(created_at), 1) AS days_pending
+                FROM issues INDEXED BY idx_issues_urgent_open
+                WHERE acknowledged = 0 OR completed = 0
+                ORDER BY upvotes DESC, created_at ASC
                 LIMIT ?
             """, (limit,))
-            results = cursor.fetchall()
-            conn.close()
             urgent_issues = []
-            for row in results:
+            for issue_id, title, category, constituency, upvotes, assigned_to, acknowledged, days_pending in cursor.fetchall():
                 urgent_issues.append({
-                    'id': row['id'],
-                    'title': row['title'],
-                    'category': row['category'],
-                    'constituency': row['constituency'],
-                    'upvotes': row['upvotes'],
-                    'days_pending': round(row['days_pending'], 1),
-                    'status': 'Acknowledged' if row['acknowledged'] else 'Pending',
-                    'assigned_to': row['assigned_to'] or 'Unassigned'
+                    'id': issue_id,
+                    'title': title,
+                    'category': category,
+                    'constituency': constituency,
+                    'upvotes': upvotes,
+                    'days_pending': days_pending,
+                    'status': 'Acknowledged' if acknowledged else 'Pending',
+                    'assigned_to': assigned_to or 'Unassigned'
                 })
             return urgent_issues
         except Exception as e:
             print(f"Urgent issues error: {e}")
             return []
 
+    def _submit_sections(self, refresh=False, urgent_limit=10):
+        """Start every dashboard data query on the executor, keyed like the dashboard dict."""
+        # The sections are independent, so run them side by side; each worker
+        # borrows its own connection from the read pool.
+        return {
+            'overview': self._executor.submit(self.get_department_overview, refresh),
+            'category_performance': self._executor.submit(self.get_category_performance, refresh),
+            'constituency_performance': self._executor.submit(self.get_constituency_performance, refresh),
+            'time_series': self._executor.submit(self.get_time_series_data, refresh=refresh),
+            'urgent_issues': self._executor.submit(self.get_urgent_issues, urgent_limit)
+        }
+
     def generate_ai_insight(self):
         """Return a single AI-generated insight string using Groq."""
+        # Without a client the insight is never built, so don't start the queries
+        sections = self._submit_sections(urgent_limit=5) if self.groq_client else {}
+        return self._generate_ai_insight(sections)
+
+    def _generate_ai_insight(self, sections):
+        """Build the insight prompt from section futures and send it to Groq."""
         if not self.groq_client:
             return 'AI insights unavailable - Groq API not configured.'
         try:
-            overview = self.get_department_overview()
-            categories = self.get_category_performance()
-            constituencies = self.get_constituency_performance()
-            time_series = self.get_time_series_data()
-            urgent_issues = self.get_urgent_issues(5)
+            overview = sections['overview'].result()
+            categories = sections['category_performance'].result()
+            constituencies = sections['constituency_performance'].result()
+            time_series = sections['time_series'].result()
+            urgent_issues = sections['urgent_issues'].result()
             # Prepare one simple prompt
             data_summary = f"""
 DEPARTMENT SUMMARY:
@@ -230,14 +545,12 @@ Give a single insight about departmental performance, upcoming issues, or improv
             print(f"AI insights error: {e}")
             return f'AI insight generation failed: {str(e)}'
 
-    def get_comprehensive_dashboard_data(self):
+    def get_comprehensive_dashboard_data(self, refresh=False):
         """Get all dashboard data including direct AI insight."""
-        return {
-            'overview': self.get_department_overview(),
-            'category_performance': self.get_category_performance(),
-            'constituency_performance': self.get_constituency_performance(),
-            'time_series': self.get_time_series_data(),
-            'urgent_issues': self.get_urgent_issues(),
-            'ai_insight': self.generate_ai_insight(),
-            'generated_at': datetime.now().isoformat()
-        }
+        futures = self._submit_sections(refresh)
+        # The insight prompt is built from the same futures, so the Groq call
+        # starts as soon as the queries resolve instead of re-running them.
+        futures['ai_insight'] = self._executor.submit(self._generate_ai_insight, futures)
+        data = {key: future.result() for key, future in futures.items()}
+        data['generated_at'] = datetime.now().isoformat()
+        return data
@@ -19,7 +19,146 @@ Usage in app.py:
 import os
 import yaml
 import re
-from PIL import Image
+import functools
+import hashlib
+import sqlite3
+import struct
+import tempfile
+import threading
+from collections import OrderedDict
+import requests
+from PIL import Image, ImageOps
+
+CACHE_MAXSIZE = 1024
+
+# Placeholders _extract_caption returns when Florence-2 gave nothing usable;
+# these are never cached so a bad response doesn't stick to an image
+NO_CAPTION = "No caption generated"
+CAPTION_EXTRACTION_FAILED = "Caption extraction failed"
+
+# Florence-2 rescales inputs to ~768px anyway, so larger uploads are shrunk first
+CAPTION_MAX_SIDE = 1024
+
+# Bytes read from the start of an upload when parsing its dimensions
+PEEK_SIZE = 64 * 1024
+
+# JPEG start-of-frame markers (C4, C8 and CC share the range but are not frames)
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def _jpeg_dimensions(head):
+    i = 2
+    while i + 9 <= len(head):
+        if head[i] != 0xFF:
+            return None
+        marker = head[i + 1]
+        if marker == 0xFF:
+            # fill byte before the real marker
+            i += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:
+            # markers without a length field
+            i += 2
+            continue
+        if marker in _JPEG_SOF_MARKERS:
+            height, width = struct.unpack('>HH', head[i + 5:i + 9])
+            return width, height
+        segment_length = struct.unpack('>H', head[i + 2:i + 4])[0]
+        i += 2 + segment_length
+    return None
+
+
+def _peek_dimensions(fp):
+    """
+    Read (width, height) straight from the image header without decoding it.
+
+    Returns None when the format is unknown or the header can't be parsed from the
+    first PEEK_SIZE bytes, in which case callers should fall back to PIL.
+    """
+    position = fp.tell()
+    head = fp.read(PEEK_SIZE)
+    fp.seek(position)
+    if head.startswith(b'\x89PNG\r\n\x1a\n') and head[12:16] == b'IHDR':
+        return struct.unpack('>II', head[16:24])
+    if head[:6] in (b'GIF87a', b'GIF89a'):
+        return struct.unpack('<HH', head[6:10])
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        chunk = head[12:16]
+        if chunk == b'VP8 ' and len(head) >= 30:
+            width, height = struct.unpack('<HH', head[26:30])
+            return width & 0x3FFF, height & 0x3FFF
+        if chunk == b'VP8L' and len(head) >= 25:
+            bits = int.from_bytes(head[21:25], 'little')
+            return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+        if chunk == b'VP8X' and len(head) >= 30:
+            return int.from_bytes(head[24:27], 'little') + 1, int.from_bytes(head[27:30], 'little') + 1
+        return None
+    if head[:3] == b'\xff\xd8\xff':
+        return _jpeg_dimensions(head)
+    return None
+
+# Score extraction patterns, compiled once for the per-upload scoring path
+_SCORE_LINE_RE = re.compile(r'^(?=.*score).*?(\d+)', re.IGNORECASE | re.MULTILINE)
+_DIGIT_RE = re.compile(r'(\d+)')
+
+# Florence-2 returns a one-entry dict repr such as {'<DETAILED_CAPTION>': 'A road ...'}
+_CAPTION_RE = re.compile(r"""\{\s*(['"]).*?\1\s*:\s*(['"])(.*)\2\s*\}""", re.DOTALL)
+
+# Leading magic bytes of the accepted image formats
+IMAGE_SIGNATURES = (
+    b'\x89PNG\r\n\x1a\n',
+    b'\xff\xd8\xff',
+    b'GIF87a',
+    b'GIF89a',
+)
+
+# One issue_validations row; shared by report_issue and flush_validations
+VALIDATION_INSERT_SQL = """
+    INSERT INTO issue_validations
+    (issue_id, image_valid, image_msg, florence_caption, civic_score, score_key)
+    VALUES (?, ?, ?, ?, ?, ?)"""
+
+def score_key(caption, description):
+    """Digest identifying a (caption, description) pair, stored as issue_validations.score_key."""
+    text = f"{caption}\0{description}".encode("utf-8")
+    return hashlib.blake2b(text, digest_size=16).hexdigest()
+
+def ensure_validations_schema(conn):
+    """Add and index issue_validations.score_key, backfilling keys for older rows."""
+    has_table = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'issue_validations'"
+    ).fetchone()
+    if not has_table:
+        return
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(issue_validations)")]
+    if 'score_key' not in columns:
+        conn.execute("ALTER TABLE issue_validations ADD COLUMN score_key TEXT")
+        rows = conn.execute("""
+            SELECT v.id, v.florence_caption, i.description
+            FROM issue_validations v
+            JOIN issues i ON i.id = v.issue_id
+            WHERE v.civic_score IS NOT NULL
+        """).fetchall()
+        conn.executemany(
+            "UPDATE issue_validations SET score_key = ? WHERE id = ?",
+            [(score_key(caption, description), row_id) for row_id, caption, description in rows]
+        )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_validations_score_key ON issue_validations(score_key, created_at)")
+    conn.commit()
+
+@functools.lru_cache(maxsize=None)
+def _load_groq_key(config_path):
+    """Read the Groq key from config (or GROQ_API_KEY) once per config path."""
+    try:
+        if os.path.exists(config_path):
+            with open(config_path, "r") as f:
+                config = yaml.safe_load(f)
+                if config and "groq" in config:
+                    return config["groq"].get("api_key")
+        return os.environ.get("GROQ_API_KEY")
+    except Exception as e:
+        print(f"⚠️ Could not load Groq API key: {e}")
+        return None
 
 class CivicValidator:
     """
@@ -28,22 +167,23 @@ class CivicValidator:
     Provides image validation, captioning, and strict score string output.
     """
 
-    def __init__(self, groq_api_key=None, config_path="config.yaml"):
-        self.groq_api_key = groq_api_key or self._load_groq_key(config_path)
+    def __init__(self, groq_api_key=None, config_path="config.yaml", database_path="civic_issues.db"):
+        self.groq_api_key = groq_api_key or _load_groq_key(config_path)
+        self.database_path = database_path
         self.ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
         self.florence_client = self._init_florence_client()
-
-    def _load_groq_key(self, config_path):
-        try:
-            if os.path.exists(config_path):
-                with open(config_path, "r") as f:
-                    config = yaml.safe_load(f)
-                    if config and "groq" in config:
-                        return config["groq"].get("api_key")
-            return os.environ.get("GROQ_API_KEY")
-        except Exception as e:
-            print(f"⚠️ Could not load Groq API key: {e}")
-            return None
+        # Keep-alive session so repeated scoring calls reuse the Groq TLS connection
+        self._http = requests.Session()
+        self._http.headers.update({
+            "Authorization": f"Bearer {self.groq_api_key}",
+            "Content-Type": "application/json"
+        })
+        # LRU caches for the remote calls: captions keyed by image content digest,
+        # scores keyed by a digest of the (caption, description) pair
+        self._caption_cache = OrderedDict()
+        self._score_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._ensure_schema()
 
     def _init_florence_client(self):
         try:
@@ -55,11 +195,92 @@ class CivicValidator:
             print(f"⚠️ Florence-2 not available: {e}")
             return None
 
+    def _ensure_schema(self):
+        if not self.database_path or not os.path.exists(self.database_path):
+            return
+        try:
+            conn = sqlite3.connect(self.database_path)
+            try:
+                ensure_validations_schema(conn)
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"Validator: schema error: {e}")
+
+    def _cache_get(self, cache, key):
+        with self._cache_lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+            return value
+
+    def _cache_put(self, cache, key, value):
+        with self._cache_lock:
+            cache[key] = value
+            cache.move_to_end(key)
+            if len(cache) > CACHE_MAXSIZE:
+                cache.popitem(last=False)
+
+    def _file_digest(self, path):
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(65536), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _lookup_stored_score(self, key):
+        """Return a score already recorded in issue_validations under this score_key, if any."""
+        if not self.database_path or not os.path.exists(self.database_path):
+            return None
+        try:
+            conn = sqlite3.connect(self.database_path)
+            try:
+                # '000' is also the fallback for failed scoring, so don't reuse it
+                row = conn.execute("""
+                    SELECT civic_score
+                    FROM issue_validations
+                    WHERE score_key = ?
+                      AND civic_score IS NOT NULL AND civic_score != '000'
+                    ORDER BY created_at DESC
+                    LIMIT 1
+                """, (key,)).fetchone()
+            finally:
+                conn.close()
+            return row[0] if row else None
+        except sqlite3.Error as e:
+            print(f"Validator: score lookup error: {e}")
+            return None
+
+    def flush_validations(self, rows):
+        """
+        Insert (issue_id, image_valid, image_msg, florence_caption, civic_score, score_key)
+        rows into issue_validations in a single transaction, so a batch costs one commit.
+        """
+        rows = list(rows)
+        if not rows:
+            return 0
+        conn = sqlite3.connect(self.database_path)
+        try:
+            conn.execute("BEGIN")
+            conn.executemany(VALIDATION_INSERT_SQL, rows)
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        return len(rows)
+
     def allowed_file(self, filename):
         if not filename:
             return False
         return '.' in filename and filename.rsplit('.', 1)[1].lower() in self.ALLOWED_EXTENSIONS
 
+    def _has_image_signature(self, header):
+        if header.startswith(IMAGE_SIGNATURES):
+            return True
+        return header[:4] == b'RIFF' and header[8:12] == b'WEBP'
+
     def validate_image_file(self, file):
         try:
             if not file:
@@ -67,12 +288,18 @@ class CivicValidator:
             if not self.allowed_file(file.filename):
                 return False, "Invalid file type."
             file.seek(0)
-            img = Image.open(file)
-            img.verify()
-            file.seek(0)
-            img = Image.open(file)
-            width, height = img.size
+            header = file.read(16)
             file.seek(0)
+            if not self._has_image_signature(header):
+                return False, "Invalid image file: unrecognized image data"
+            dimensions = _peek_dimensions(file)
+            if dimensions is None:
+                # Image.open only parses the header; size is known without decoding pixels
+                img = Image.open(file)
+                dimensions = img.size
+                img.close()
+                file.seek(0)
+            width, height = dimensions
             if width < 100 or height < 100:
                 return False, "Image too small."
             if width > 4000 or height > 4000:
@@ -88,41 +315,87 @@ class CivicValidator:
         if not os.path.exists(image_path):
             return "Image file not found"
         try:
+            digest = self._file_digest(image_path)
+            caption = self._cache_get(self._caption_cache, digest)
+            if caption is not None:
+                return caption
             from gradio_client import handle_file
-            result = self.florence_client.predict(
-                image=handle_file(image_path),
-                task_prompt="Detailed Caption",
-                text_input=None,
-                model_id="microsoft/Florence-2-large",
-                api_name="/process_image"
-            )
+            upload_path = self._prepare_caption_image(image_path)
+            try:
+                result = self.florence_client.predict(
+                    image=handle_file(upload_path),
+                    task_prompt="Detailed Caption",
+                    text_input=None,
+                    model_id="microsoft/Florence-2-large",
+                    api_name="/process_image"
+                )
+            finally:
+                if upload_path != image_path:
+                    os.remove(upload_path)
             caption = self._extract_caption(result)
+            if caption not in (NO_CAPTION, CAPTION_EXTRACTION_FAILED):
+                self._cache_put(self._caption_cache, digest, caption)
             return caption
         except Exception as e:
             return f"Caption generation failed: {str(e)}"
 
+    def _prepare_caption_image(self, image_path):
+        """
+        Return a path to send to Florence-2: the original if it is already small,
+        otherwise a temporary JPEG downscaled to CAPTION_MAX_SIDE (caller removes it).
+        """
+        try:
+            with Image.open(image_path) as img:
+                if max(img.size) <= CAPTION_MAX_SIDE:
+                    return image_path
+                # let the JPEG decoder skip straight to a reduced scale where it can
+                img.draft('RGB', (CAPTION_MAX_SIDE, CAPTION_MAX_SIDE))
+                # the re-encoded JPEG carries no EXIF, so apply the Orientation tag
+                # to the pixels or phone photos reach Florence-2 sideways
+                img = ImageOps.exif_transpose(img)
+                img = img.convert('RGB')
+                img.thumbnail((CAPTION_MAX_SIDE, CAPTION_MAX_SIDE), Image.BILINEAR)
+                with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as tmp:
+                    img.save(tmp, 'JPEG', quality=85)
+                return tmp.name
+        except Exception as e:
+            print(f"⚠️ Could not downscale image for captioning: {e}")
+            return image_path
+
     def _extract_caption(self, result):
         try:
             if isinstance(result, (list, tuple)) and len(result) >= 1:
-                caption = str(result[0]) if result[0] else "No caption generated"
+                caption = str(result[0]) if result[0] else NO_CAPTION
             else:
-                caption = str(result) if result else "No caption generated"
+                caption = str(result) if result else NO_CAPTION
             if caption.startswith('{') and caption.endswith('}'):
-                import ast
-                try:
-                    caption_dict = ast.literal_eval(caption)
-                    if isinstance(caption_dict, dict):
-                        caption = list(caption_dict.values())[0]
-                except:
-                    pass
+                match = _CAPTION_RE.fullmatch(caption)
+                value = match.group(3) if match else None
+                # a stray quote or escape means more than one entry or an escaped
+                # character, which only the full parser handles correctly
+                if value is not None and match.group(2) not in value and '\\' not in value:
+                    caption = value
+                else:
+                    import ast
+                    try:
+                        caption_dict = ast.literal_eval(caption)
+                        if isinstance(caption_dict, dict):
+                            caption = list(caption_dict.values())[0]
+                    except:
+                        pass
             return caption
         except:
-            return "Caption extraction failed"
+            return CAPTION_EXTRACTION_FAILED
 
     def get_civic_score_strict3(self, caption, description):
         """
         Returns ONLY a strict 3-digit string score as required (e.g., '087') for direct API app integration.
         """
+        key = score_key(caption, description)
+        score = self._cache_get(self._score_cache, key) or self._lookup_stored_score(key)
+        if score is not None:
+            self._cache_put(self._score_cache, key, score)
+            return score
         prompt_text = f"""You are a civic issue validator. 
 Your task is to strictly rate the civic relevance of the report (0-100).
 Evaluate BOTH the AI-generated image caption and the user-provided description. 
@@ -156,11 +429,6 @@ Respond EXACTLY in this format:
 
 Where <number> is an integer from 0 to 100, zero-padded to 3 digits (e.g., 007, 085)."""
         # ---- Groq API Request ----
-        import requests
-        headers = {
-            "Authorization": f"Bearer {self.groq_api_key}",
-            "Content-Type": "application/json"
-        }
         data = {
             "model": "openai/gpt-oss-20b",
             "messages": [
@@ -171,10 +439,15 @@ Where <number> is an integer from 0 to 100, zero-padded to 3 digits (e.g., 007,
         }
         url = "https://api.groq.com/openai/v1/chat/completions"
         try:
-            response = requests.post(url, headers=headers, json=data)
+            response = self._http.post(url, json=data, timeout=30)
             if response.status_code == 200:
                 text = response.json()["choices"][0]["message"]["content"]
-                return self._strict3score(text)
+                score = self._strict3score(text)
+                # '000' is also what a reply without a number parses to, so only
+                # real scores are cached
+                if score != "000":
+                    self._cache_put(self._score_cache, key, score)
+                return score
         except Exception as e:
             print(f"Validator: scoring error: {e}")
         return "000"  # fallback
@@ -183,19 +456,11 @@ Where <number> is an integer from 0 to 100, zero-padded to 3 digits (e.g., 007,
         """
         Extracts the integer score from text and outputs exactly a 3-digit string (zero-padded).
         """
-        lines = text.strip().split('\n')
-        for line in lines:
-            if 'score' in line.lower():
-                numbers = re.findall(r'\d+', line)
-                if numbers:
-                    val = max(0, min(100, int(numbers[0])))
-                    return f"{val:03d}"
-        # fallback for any lone number
-        for line in lines:
-            numbers = re.findall(r'\d+', line)
-            if numbers:
-                val = max(0, min(100, int(numbers[0])))
-                return f"{val:03d}"
+        # prefer the first number on a line mentioning 'score', else any lone number
+        match = _SCORE_LINE_RE.search(text) or _DIGIT_RE.search(text)
+        if match:
+            val = max(0, min(100, int(match.group(1))))
+            return f"{val:03d}"
         return "000"
 
 # -- Module-level quick usage help --
@@ -204,14 +469,19 @@ def create_validator(groq_api_key=None):
     """Create a CivicValidator instance."""
     return CivicValidator(groq_api_key=groq_api_key)
 
+@functools.lru_cache(maxsize=16)
+def _shared_validator(groq_api_key):
+    """
+    Validator per Groq key for the helpers below, so config, the Florence client
+    and the schema check load once per key instead of once per call.
+    """
+    return CivicValidator(groq_api_key=groq_api_key)
+
 def validate_image(file):
-    validator = CivicValidator()
-    return validator.validate_image_file(file)
+    return _shared_validator(None).validate_image_file(file)
 
 def generate_caption(image_path):
-    validator = CivicValidator()
-    return validator.get_florence_caption(image_path)
+    return _shared_validator(None).get_florence_caption(image_path)
 
 def score_strict3(caption, description, groq_api_key=None):
-    validator = CivicValidator(groq_api_key=groq_api_key)
-    return validator.get_civic_score_strict3(caption, description)
+    return _shared_validator(groq_api_key).get_civic_score_strict3(caption, description)